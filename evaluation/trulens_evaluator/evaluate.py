@@ -1,16 +1,19 @@
 # evaluate.py
+import asyncio
+import logging
 import os
 from pathlib import Path
 from dotenv import load_dotenv
-import time
 
 # Construct the path to the root .env file (two levels up)
 env_path = Path(__file__).resolve().parent.parent.parent / '.env'
 load_dotenv(dotenv_path=env_path)
 
-import requests
+import httpx
+import orjson
 import pandas as pd
-import numpy as np
+from aiolimiter import AsyncLimiter
+from diskcache import Cache
 
 # Updated TruLens imports for a custom RAG application
 from trulens.core.session import TruSession
@@ -19,50 +22,90 @@ from trulens.apps.app import instrument
 from trulens.core import Feedback, Select
 from trulens.providers.openai import OpenAI
 
+# --- Concurrency Settings ---
+# Questions are sent to RASS concurrently; the limiter replaces the old fixed
+# 5-second pause between questions as protection against provider rate limits.
+MAX_CONCURRENT_QUERIES = 8
+QUERIES_PER_MINUTE = 60
+
+# --- Response Cache ---
+# Set RASS_CACHE=1 to memoize RASS answers on disk so repeated runs during
+# evaluation development skip the engine (and its LLM calls) entirely.
+# Left off by default so CI always exercises the live engine.
+RASS_TOP_K = 12
+rass_cache = (
+    Cache(str(Path(__file__).resolve().parent / '.rass_resp_cache'))
+    if os.environ.get("RASS_CACHE") == "1"
+    else None
+)
+
 # --- RASS API Wrapper (Now an instrumented class) ---
 class RASS_App:
     def __init__(self):
         self.engine_url = "http://localhost:8000/ask"
+        # One pooled keep-alive client per app instead of a new connection per question.
+        # Increased timeout for potentially slower, higher-quality models
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=16, max_keepalive_connections=MAX_CONCURRENT_QUERIES),
+            timeout=60,
+        )
+
+    async def aclose(self):
+        await self.client.aclose()
 
     @instrument
-    def query_with_context(self, query: str) -> dict:
+    async def query_with_context(self, query: str) -> dict:
         """
         This method is now instrumented. TruLens will track its inputs,
         and its full dictionary output (answer and context).
         """
+        cache_key = (query, RASS_TOP_K)
+        cached = rass_cache.get(cache_key) if rass_cache is not None else None
+        if cached is not None:
+            return cached
+
         try:
-            # Increased timeout for potentially slower, higher-quality models
-            response = requests.post(self.engine_url, json={"query": query, "top_k": 12}, timeout=60)
+            response = await self.client.post(self.engine_url, json={"query": query, "top_k": RASS_TOP_K})
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             
             answer = data.get("answer", "No answer found.")
             source_docs = data.get('source_documents', [])
             
             # --- ROBUST CONTEXT EXTRACTION ---
             # This handles cases where docs might be structured differently or be empty.
-            context_list = []
-            if source_docs and isinstance(source_docs, list):
-                for doc in source_docs:
-                    # Check for nested text fields common in RAG responses
-                    if isinstance(doc, dict):
-                        text = doc.get('_source', {}).get('text') or doc.get('text')
-                        if text:
-                            context_list.append(str(text))
-            
-            context = "\n\n".join(context_list)
+            if not isinstance(source_docs, list):
+                source_docs = []
+            # Check for nested text fields common in RAG responses
+            context = "\n\n".join(
+                str(text)
+                for doc in source_docs
+                if isinstance(doc, dict)
+                for text in ((doc.get('_source') or {}).get('text') or doc.get('text'),)
+                if text
+            )
             
             # If after all that the context is still empty, log a warning.
             if not context:
                 logging.warning(f"No text found in source_documents for query: '{query}'")
 
-            return {"answer": answer, "context": context}
+            result = {"answer": answer, "context": context}
+            # Degraded responses (no retrieved text) are not cached so they stop
+            # being served as soon as the engine is fixed.
+            if rass_cache is not None and context:
+                rass_cache[cache_key] = result
+            return result
             
-        except requests.exceptions.RequestException as e:
+        except (httpx.HTTPError, orjson.JSONDecodeError) as e:
             logging.error(f"Error calling RASS Engine: {e}")
             return {"answer": f"Error: {e}", "context": ""}
 
 # --- TruLens Setup (Upgraded for the RAG Triad) ---
+def _mean(scores):
+    # select_context is the single joined context string, so this usually sees one
+    # score per record; plain Python avoids NumPy's dispatch overhead for that.
+    return sum(scores) / len(scores)
+
 def setup_trulens_evaluator():
     provider = OpenAI()
 
@@ -85,11 +128,33 @@ def setup_trulens_evaluator():
         Feedback(provider.context_relevance, name="Context Relevance")
         .on_input()
         .on(select_context)
-        .aggregate(np.mean)
+        .aggregate(_mean)
     )
     
     return [f_groundedness, f_answer_relevance, f_context_relevance]
 
+# --- Concurrent Question Runner ---
+async def run_all(rass_app, tru_recorder, questions):
+    sem = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+    limiter = AsyncLimiter(QUERIES_PER_MINUTE, 60)
+
+    async def one(i, question):
+        # A failure on one question is logged and must not cancel the rest of the run.
+        try:
+            async with sem, limiter:
+                response_dict = await rass_app.query_with_context(question)
+        except Exception as e:
+            logging.error(f"Question {i} failed: {e}")
+            return
+        print(f"\n[Question {i}/{len(questions)}]: {question}")
+        print(f"[Answer]: {response_dict['answer'][:200]}...")
+
+    try:
+        with tru_recorder as recording:
+            await asyncio.gather(*(one(i, q) for i, q in enumerate(questions, 1)))
+    finally:
+        await rass_app.aclose()
+
 # --- Main Evaluation Logic ---
 if __name__ == "__main__":
     if not os.environ.get("OPENAI_API_KEY"):
@@ -132,15 +197,7 @@ if __name__ == "__main__":
 
     print("--- Starting Enhanced RASS Evaluation ---")
     
-    for i, question in enumerate(evaluation_questions, 1):
-        print(f"\n[Question {i}/{len(evaluation_questions)}]: {question}")
-        
-        with tru_recorder as recording:
-            response_dict = rass_app.query_with_context(question)
-            print(f"[Answer]: {response_dict['answer'][:200]}...")
-        
-        print("Waiting 5 seconds to avoid rate limiting...")
-        time.sleep(5) # Wait for 5 seconds before the next question
+    asyncio.run(run_all(rass_app, tru_recorder, evaluation_questions))
 
     print("\n--- Evaluation Complete ---")
     
@@ -68,6 +68,13 @@ describe("rass-engine-service/src/config.js", () => {
     expect(config.OPENAI_EMBED_MODEL_FOR_SEARCH_TERMS).toBe("text-embedding-3-large");
   });
 
+  test("defaults RERANKER_MAX_CHARS to 2000 when omitted", () => {
+    fs.readFileSync.mockReturnValue(yaml.dump(VALID_CONFIG));
+    const config = loadConfig();
+
+    expect(config.RERANKER_MAX_CHARS).toBe(2000);
+  });
+
   test("throws a descriptive error when a required field is missing", () => {
     const missingFieldConfig = { ...VALID_CONFIG };
     delete missingFieldConfig.OPENSEARCH_HOST;
@@ -0,0 +1,109 @@
+// rass-engine-service/src/__tests__/localCrossEncoderProvider.test.js
+// Unit tests for LocalCrossEncoderProvider — document truncation and rerank response caching.
+
+"use strict";
+
+jest.mock("axios");
+jest.mock("../logger", () => ({
+  info: jest.fn(),
+  debug: jest.fn(),
+  warn: jest.fn(),
+  error: jest.fn(),
+}));
+
+const DOCS = [{ _source: { text: "first passage" } }, { _source: { text: "second passage" } }];
+const RESULTS = [
+  { index: 1, score: 0.9 },
+  { index: 0, score: 0.2 },
+];
+
+// Load a fresh copy of the provider (and its axios mock) so the module-level
+// cache starts empty in every test.
+function loadProvider(config = {}) {
+  let axios;
+  let LocalCrossEncoderProvider;
+  jest.isolateModules(() => {
+    axios = require("axios");
+    ({ LocalCrossEncoderProvider } = require("../retrieval/reranking/LocalCrossEncoderProvider"));
+  });
+  axios.post.mockResolvedValue({ data: { results: RESULTS } });
+  return { axios, provider: new LocalCrossEncoderProvider(config) };
+}
+
+describe("LocalCrossEncoderProvider rerank cache", () => {
+  test("serves a repeated (query, documents, topN) call from cache without a second POST", async () => {
+    const { axios, provider } = loadProvider();
+
+    const first = await provider.rerank("martians", DOCS, 2);
+    const second = await provider.rerank("martians", DOCS, 2);
+
+    expect(axios.post).toHaveBeenCalledTimes(1);
+    expect(second).toEqual(first);
+    expect(second[0]._source.text).toBe("second passage");
+    expect(second[0].rerankScore).toBe(0.9);
+  });
+
+  test("treats a different topN as a cache miss", async () => {
+    const { axios, provider } = loadProvider();
+
+    await provider.rerank("martians", DOCS, 2);
+    await provider.rerank("martians", DOCS, 1);
+
+    expect(axios.post).toHaveBeenCalledTimes(2);
+  });
+
+  test("does not cache a failed request", async () => {
+    const { axios, provider } = loadProvider();
+    axios.post.mockRejectedValueOnce(new Error("ECONNREFUSED"));
+
+    const fallback = await provider.rerank("martians", DOCS, 2);
+    const retried = await provider.rerank("martians", DOCS, 2);
+
+    expect(fallback).toEqual(DOCS.slice(0, 2));
+    expect(axios.post).toHaveBeenCalledTimes(2);
+    expect(retried[0].rerankScore).toBe(0.9);
+  });
+
+  test("evicts the least-recently-used entry when entry 2049 is added", async () => {
+    const { axios, provider } = loadProvider();
+
+    for (let i = 0; i < 2048; i++) {
+      await provider.rerank(`query-${i}`, DOCS, 2);
+    }
+    // Touch query-0 so query-1 becomes the least recently used entry.
+    await provider.rerank("query-0", DOCS, 2);
+    expect(axios.post).toHaveBeenCalledTimes(2048);
+
+    await provider.rerank("query-2048", DOCS, 2);
+    expect(axios.post).toHaveBeenCalledTimes(2049);
+
+    await provider.rerank("query-0", DOCS, 2);
+    expect(axios.post).toHaveBeenCalledTimes(2049);
+
+    await provider.rerank("query-1", DOCS, 2);
+    expect(axios.post).toHaveBeenCalledTimes(2050);
+  });
+});
+
+describe("LocalCrossEncoderProvider document truncation", () => {
+  test("caps POSTed documents at RERANKER_MAX_CHARS", async () => {
+    const { axios, provider } = loadProvider({ RERANKER_MAX_CHARS: 10 });
+    const docs = [{ _source: { text: "x".repeat(50) } }, { _source: { text: "short" } }];
+
+    await provider.rerank("martians", docs, 2);
+
+    const { documents } = axios.post.mock.calls[0][1];
+    expect(documents).toEqual(["x".repeat(10), "short"]);
+  });
+
+  test("does not split a surrogate pair at the cut", async () => {
+    const { axios, provider } = loadProvider({ RERANKER_MAX_CHARS: 10 });
+    // The emoji occupies code units 9 and 10, straddling the 10-char limit.
+    const docs = [{ _source: { text: "abcdefghi\u{1F600}xyz" } }];
+
+    await provider.rerank("martians", docs, 1);
+
+    const { documents } = axios.post.mock.calls[0][1];
+    expect(documents).toEqual(["abcdefghi"]);
+  });
+});
@@ -53,6 +53,7 @@ module.exports = {
   RERANK_TOP_N: config.RERANK_TOP_N,
   COHERE_RERANK_MODEL: config.COHERE_RERANK_MODEL,
   RERANKER_PORT: config.RERANKER_PORT,
+  RERANKER_MAX_CHARS: config.RERANKER_MAX_CHARS,
   // Phase C: HyDE
   HYDE_ENABLED: config.HYDE_ENABLED,
   HYDE_MAX_TOKENS: config.HYDE_MAX_TOKENS,
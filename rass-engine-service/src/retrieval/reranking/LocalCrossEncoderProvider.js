@@ -6,44 +6,93 @@
 
 "use strict";
 
+const crypto = require("crypto");
 const axios = require("axios");
 const { RerankProvider } = require("./RerankProvider");
 const logger = require("../../logger");
 
+// In-process LRU cache of reranker responses keyed by a hash of (query, documents, topN).
+// Identical candidate sets recur (e.g. repeated evaluation questions), and a hit skips
+// the HTTP round trip and the cross-encoder forward pass entirely.
+// Map preserves insertion order, so the first key is always the least recently used.
+const RERANK_CACHE_MAX_ENTRIES = 2048;
+const rerankCache = new Map(); // hash → [{ index, score }]
+
+function rerankCacheKey(query, docTexts, topN) {
+  const hash = crypto.createHash("sha256");
+  hash.update(`${topN}\0${query}`);
+  for (const text of docTexts) hash.update(`\0${text}`);
+  return hash.digest("hex");
+}
+
+function getCachedRanking(key) {
+  const ranked = rerankCache.get(key);
+  if (!ranked) return null;
+  rerankCache.delete(key);
+  rerankCache.set(key, ranked);
+  return ranked;
+}
+
+function setCachedRanking(key, ranked) {
+  rerankCache.set(key, ranked);
+  if (rerankCache.size > RERANK_CACHE_MAX_ENTRIES) {
+    rerankCache.delete(rerankCache.keys().next().value);
+  }
+}
+
+// Cut text to maxChars UTF-16 code units without leaving a lone high surrogate at the end,
+// which would reach the Python service as an unpaired \udXXX escape.
+function truncateText(text, maxChars) {
+  if (text.length <= maxChars) return text;
+  const cut = text.slice(0, maxChars);
+  const last = cut.charCodeAt(cut.length - 1);
+  return last >= 0xd800 && last <= 0xdbff ? cut.slice(0, -1) : cut;
+}
+
 class LocalCrossEncoderProvider extends RerankProvider {
   /**
    * @param {object} config - Service config object.
    * @param {number} [config.RERANKER_PORT] - Port of the local reranker service.
    * @param {number} [config.RERANK_TOP_N]  - Max docs to return.
+   * @param {number} [config.RERANKER_MAX_CHARS] - Per-document character cap before sending.
    */
   constructor(config) {
     super();
     const port = config?.RERANKER_PORT || 8008;
     this.rerankUrl = process.env.RERANKER_URL || `http://localhost:${port}/rerank`;
     this.topN = config?.RERANK_TOP_N || 5;
+    this.maxChars = config?.RERANKER_MAX_CHARS || 2000;
   }
 
   async rerank(query, documents, topN) {
     const n = topN || this.topN;
-    const docTexts = documents.map((d) => d._source?.text || "");
+    // The cross-encoder truncates to its max sequence length after tokenizing the whole
+    // string; pre-truncating avoids tokenizing (and transferring) text that is discarded.
+    const docTexts = documents.map((d) => truncateText(d._source?.text || "", this.maxChars));
 
     logger.info(
       `[LocalCrossEncoderProvider] Reranking ${documents.length} docs via ${this.rerankUrl} (topN=${n}).`
     );
 
-    let ranked;
-    try {
-      const response = await axios.post(
-        this.rerankUrl,
-        { query, documents: docTexts, top_n: n },
-        { timeout: 20000 }
-      );
-      ranked = response.data.results;
-    } catch (err) {
-      logger.error(
-        `[LocalCrossEncoderProvider] Request failed: ${err.message}. Returning original order.`
-      );
-      return documents.slice(0, n);
+    const cacheKey = rerankCacheKey(query, docTexts, n);
+    let ranked = getCachedRanking(cacheKey);
+    if (ranked) {
+      logger.debug("[LocalCrossEncoderProvider] Rerank cache hit.");
+    } else {
+      try {
+        const response = await axios.post(
+          this.rerankUrl,
+          { query, documents: docTexts, top_n: n },
+          { timeout: 20000 }
+        );
+        ranked = response.data.results;
+      } catch (err) {
+        logger.error(
+          `[LocalCrossEncoderProvider] Request failed: ${err.message}. Returning original order.`
+        );
+        return documents.slice(0, n);
+      }
+      if (Array.isArray(ranked)) setCachedRanking(cacheKey, ranked);
     }
 
     const reranked = ranked.map((r) => {
@@ -66,6 +66,7 @@ const ConfigSchema = z
       .default("none"),
     RERANK_TOP_N: z.number().int().positive().optional().default(5),
     COHERE_RERANK_MODEL: z.string().min(1).optional(),
+    RERANKER_MAX_CHARS: z.number().int().positive().optional().default(2000),
 
     // Phase C: HyDE
     HYDE_ENABLED: z.boolean().optional().default(false),